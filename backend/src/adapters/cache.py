@@ -0,0 +1,61 @@
+"""In-process TTL + LRU cache used in front of hot repository lookups."""
+
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Generic, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """Bounded mapping whose entries expire ``ttl`` seconds after insertion.
+
+    Least-recently-used entries are evicted once ``maxsize`` is exceeded. All
+    access happens on the event loop thread, so no locking is needed. A
+    ``maxsize`` or ``ttl`` of zero disables caching entirely.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        """True when entries can be stored."""
+        return self._maxsize > 0 and self._ttl > 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: K) -> V | None:
+        """Return the cached value or None if missing/expired."""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if expires <= time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        """Store a value, evicting the least-recently-used entry when full."""
+        if not self.enabled:
+            return
+        self._data[key] = (time.monotonic() + self._ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self._maxsize:
+            self._data.popitem(last=False)
+
+    def invalidate(self, *keys: K) -> None:
+        """Drop the given keys if present."""
+        for key in keys:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._data.clear()
@@ -1,13 +1,14 @@
 """Repository adapter for Link using Motor (async MongoDB)."""
 
+from collections.abc import Sequence
 from datetime import UTC, datetime
 
 from motor.motor_asyncio import AsyncIOMotorCollection
 from pymongo import ReturnDocument
 from pymongo.errors import DuplicateKeyError
 
-from src.domain.entities import Link
-from src.domain.errors import ConflictError, NotFoundError
+from src.domain.entities import Link, RedirectTarget
+from src.domain.errors import ConflictError, GoneError, NotFoundError, UnauthorizedError
 
 
 def _doc_to_entity(doc: dict[str, object]) -> Link:
@@ -23,6 +24,30 @@ def _doc_to_entity(doc: dict[str, object]) -> Link:
     )
 
 
+def _update_spec(changes: dict[str, object]) -> dict[str, object]:
+    """Build an update document stamping updated_at with the server clock."""
+    spec: dict[str, object] = {"$currentDate": {"updated_at": True}}
+    if changes:
+        spec["$set"] = changes
+    return spec
+
+
+def _token_filter(edit_token_hash: str, legacy_token_hash: str | None) -> object:
+    """Match the current token hash, or either form while legacy hashes remain."""
+    if legacy_token_hash is None:
+        return edit_token_hash
+    return {"$in": [edit_token_hash, legacy_token_hash]}
+
+
+# Projection for the redirect hot path: skip timestamps and the token hash
+_REDIRECT_PROJECTION: dict[str, int] = {
+    "_id": 0,
+    "target_url": 1,
+    "redirect_code": 1,
+    "expires_at": 1,
+}
+
+
 class LinkRepository:
     """MongoDB-backed async repository for Link entities."""
 
@@ -36,11 +61,43 @@ class LinkRepository:
             raise NotFoundError("link not found")
         return _doc_to_entity(doc)
 
+    async def get_for_redirect(self, link_id: str) -> RedirectTarget:
+        """Fetch a live link's redirect fields; raise NotFoundError or GoneError.
+
+        The active/expiry predicate is evaluated by MongoDB so the hot path is a
+        single unique-index probe; the existence check that tells 404 from 410
+        only runs on a miss.
+        """
+        doc = await self._col.find_one(
+            {
+                "link_id": link_id,
+                # Documents without the field predate soft-delete and count as active
+                "active": {"$ne": False},
+                "$or": [{"expires_at": None}, {"expires_at": {"$gt": datetime.now(UTC)}}],
+            },
+            _REDIRECT_PROJECTION,
+        )
+        if doc is None:
+            if await self.exists(link_id):
+                raise GoneError("link is inactive or expired")
+            raise NotFoundError("link not found")
+        return RedirectTarget(
+            target_url=str(doc["target_url"]),
+            redirect_code=int(doc["redirect_code"]),
+            expires_at=doc.get("expires_at"),
+        )
+
     async def exists(self, link_id: str) -> bool:
         """Return True if a link with the given ID exists."""
-        doc = await self._col.find_one({"link_id": link_id}, {"_id": 1})
+        # Projecting only the indexed field lets the link_id index cover the query
+        doc = await self._col.find_one({"link_id": link_id}, {"_id": 0, "link_id": 1})
         return doc is not None
 
+    async def taken_ids(self, link_ids: Sequence[str]) -> set[str]:
+        """Return the subset of the given IDs that already exist (one query)."""
+        cursor = self._col.find({"link_id": {"$in": list(link_ids)}}, {"_id": 0, "link_id": 1})
+        return {str(doc["link_id"]) async for doc in cursor}
+
     async def create(  # noqa: PLR0913
         self,
         link_id: str,
@@ -68,6 +125,36 @@ class LinkRepository:
             raise ConflictError("link_id already exists") from exc
         return _doc_to_entity(doc)
 
+    async def create_first_available(
+        self,
+        candidates: Sequence[str],
+        target_url: str,
+        redirect_code: int,
+        edit_token_hash: str,
+    ) -> Link:
+        """Persist a new link under the first free candidate ID.
+
+        The first candidate is inserted directly since collisions are rare.
+        After a conflict the rest are screened with a single ``$in`` query, so
+        a collision burst costs one round-trip instead of one per candidate.
+        Raises ConflictError when every candidate is taken.
+        """
+        first, *rest = candidates
+        try:
+            return await self.create(first, target_url, redirect_code, edit_token_hash)
+        except ConflictError:
+            if not rest:
+                raise
+        taken = await self.taken_ids(rest)
+        for link_id in rest:
+            if link_id in taken:
+                continue
+            try:
+                return await self.create(link_id, target_url, redirect_code, edit_token_hash)
+            except ConflictError:  # claimed concurrently since the screen
+                continue
+        raise ConflictError("all candidate link ids are taken")
+
     async def update(  # noqa: PLR0913
         self,
         link_id: str,
@@ -79,7 +166,7 @@ class LinkRepository:
         edit_token_hash: str | None = None,
     ) -> Link:
         """Update mutable fields; raise NotFoundError if link not found."""
-        changes: dict[str, object] = {"updated_at": datetime.now(UTC)}
+        changes: dict[str, object] = {}
         if target_url is not None:
             changes["target_url"] = target_url
         if redirect_code is not None:
@@ -93,31 +180,94 @@ class LinkRepository:
 
         doc = await self._col.find_one_and_update(
             {"link_id": link_id},
-            {"$set": changes},
+            _update_spec(changes),
+            return_document=ReturnDocument.AFTER,
+        )
+        if doc is None:
+            raise NotFoundError("link not found")
+        return _doc_to_entity(doc)
+
+    async def update_authorized(  # noqa: PLR0913
+        self,
+        link_id: str,
+        edit_token_hash: str,
+        *,
+        legacy_token_hash: str | None = None,
+        target_url: str | None = None,
+        redirect_code: int | None = None,
+        active: bool | None = None,
+    ) -> Link:
+        """Update fields only if the stored token hash matches.
+
+        Token verification is part of the update filter, so the common case is
+        one round-trip. A document matched through legacy_token_hash has its
+        stored hash rewritten to edit_token_hash in the same update. Raises
+        NotFoundError or UnauthorizedError on a miss.
+        """
+        changes: dict[str, object] = {}
+        if legacy_token_hash is not None:
+            changes["edit_token_hash"] = edit_token_hash
+        if target_url is not None:
+            changes["target_url"] = target_url
+        if redirect_code is not None:
+            changes["redirect_code"] = redirect_code
+        if active is not None:
+            changes["active"] = active
+
+        doc = await self._col.find_one_and_update(
+            {
+                "link_id": link_id,
+                "edit_token_hash": _token_filter(edit_token_hash, legacy_token_hash),
+            },
+            _update_spec(changes),
             return_document=ReturnDocument.AFTER,
         )
         if doc is None:
+            if await self.exists(link_id):
+                raise UnauthorizedError("invalid edit token")
             raise NotFoundError("link not found")
         return _doc_to_entity(doc)
 
-    async def change_id(self, old_id: str, new_id: str) -> Link:
+    async def change_id(  # noqa: PLR0913
+        self,
+        old_id: str,
+        new_id: str,
+        *,
+        edit_token_hash: str | None = None,
+        legacy_token_hash: str | None = None,
+        target_url: str | None = None,
+        redirect_code: int | None = None,
+    ) -> Link:
         """Tombstone old alias and clone to new alias.
 
         Tombstoning semantics: old alias becomes inactive (410 Gone) while
-        new alias takes over. Original created_at is preserved.
+        new alias takes over. Original created_at is preserved. Field updates
+        are applied to the clone so the new document is written once. When
+        edit_token_hash is given, it is matched in the lookup of the old alias
+        and a mismatch raises UnauthorizedError; legacy_token_hash is accepted
+        as well, and the clone then stores edit_token_hash.
         """
-        old_doc = await self._col.find_one({"link_id": old_id})
+        query: dict[str, object] = {"link_id": old_id}
+        if edit_token_hash is not None:
+            query["edit_token_hash"] = _token_filter(edit_token_hash, legacy_token_hash)
+        old_doc = await self._col.find_one(query)
         if old_doc is None:
+            if edit_token_hash is not None and await self.exists(old_id):
+                raise UnauthorizedError("invalid edit token")
             raise NotFoundError("link not found")
 
         now = datetime.now(UTC)
         new_doc = {
             "link_id": new_id,
-            "target_url": old_doc["target_url"],
-            "redirect_code": old_doc["redirect_code"],
+            "target_url": target_url if target_url is not None else old_doc["target_url"],
+            "redirect_code": (
+                redirect_code if redirect_code is not None else old_doc["redirect_code"]
+            ),
             "created_at": old_doc["created_at"],
             "updated_at": now,
-            "edit_token_hash": old_doc["edit_token_hash"],
+            "edit_token_hash": (
+                edit_token_hash if edit_token_hash is not None else old_doc["edit_token_hash"]
+            ),
             "active": True,
             "expires_at": old_doc.get("expires_at"),
         }
@@ -127,9 +277,6 @@ class LinkRepository:
             raise ConflictError("new_link_id already exists") from exc
 
         # Tombstone old alias after successful insert
-        await self._col.update_one(
-            {"link_id": old_id},
-            {"$set": {"active": False, "updated_at": now}},
-        )
+        await self._col.update_one({"link_id": old_id}, _update_spec({"active": False}))
         return _doc_to_entity(new_doc)
 
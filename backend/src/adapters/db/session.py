@@ -1,7 +1,6 @@
 """MongoDB client and collection access for TinyURL backend."""
 
 import os
-from collections.abc import AsyncIterator
 
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection
 
@@ -14,26 +13,78 @@ def _db_name() -> str:
     return os.getenv("MONGODB_DB", "tinyurl")
 
 
-# Module-level client — created once; reused across requests
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(int(os.getenv(name, str(default))), 0)
+    except ValueError:
+        return default
+
+
+def _pool_options() -> dict[str, int]:
+    """Connection-pool tuning for the shared client.
+
+    A warm minimum keeps the redirect path from paying connection setup after
+    idle periods; the wait-queue timeout bounds how long a request queues for a
+    free connection under bursts instead of hanging indefinitely.
+    """
+    min_size = _env_int("MONGODB_MIN_POOL_SIZE", 10)
+    max_size = _env_int("MONGODB_MAX_POOL_SIZE", 100)
+    if max_size > 0:
+        # pymongo rejects min > max; a lone small max override must still boot
+        min_size = min(min_size, max_size)
+    options = {"minPoolSize": min_size, "maxPoolSize": max_size}
+    # pymongo requires these timeouts to be positive; 0 means "no limit", which
+    # is pymongo's own default, so leave the key out rather than pass 0.
+    for key, env, default in (
+        ("maxIdleTimeMS", "MONGODB_MAX_IDLE_TIME_MS", 300_000),
+        ("waitQueueTimeoutMS", "MONGODB_WAIT_QUEUE_TIMEOUT_MS", 5_000),
+    ):
+        value = _env_int(env, default)
+        if value > 0:
+            options[key] = value
+    return options
+
+
+def make_client(uri: str | None = None) -> AsyncIOMotorClient:
+    """Build a Motor client with the service's pool and timezone settings.
+
+    Args:
+        uri: MongoDB connection string; defaults to ``MONGODB_URI``.
+
+    Returns:
+        AsyncIOMotorClient: A new client. Motor connects lazily, so this does
+        no network I/O.
+    """
+    return AsyncIOMotorClient(uri or _mongodb_uri(), tz_aware=True, **_pool_options())
+
+
+# Module-level client and collection — created once; reused across requests
 _client: AsyncIOMotorClient | None = None
+_collection: AsyncIOMotorCollection | None = None
 
 
 def get_client() -> AsyncIOMotorClient:
     """Return (or lazily create) the module-level Motor client."""
     global _client  # noqa: PLW0603 - intentional module-level singleton
     if _client is None:
-        _client = AsyncIOMotorClient(_mongodb_uri(), tz_aware=True)
+        _client = make_client()
     return _client
 
 
+def get_collection() -> AsyncIOMotorCollection:
+    """Return (or lazily resolve) the links collection on the shared client.
+
+    Cached so the per-request path skips the database/collection lookups.
+    """
+    global _collection  # noqa: PLW0603 - intentional module-level singleton
+    if _collection is None:
+        _collection = get_client()[_db_name()]["links"]
+    return _collection
+
+
 async def init_db() -> None:
     """Ensure required indexes exist (idempotent)."""
-    collection = get_client()[_db_name()]["links"]
+    collection = get_collection()
     # link_id is the primary identifier; uniqueness enforced at DB level
     await collection.create_index("link_id", unique=True, background=True)
 
-
-async def get_db() -> AsyncIterator[AsyncIOMotorCollection]:
-    """Yield the links collection (no transaction needed for MVP)."""
-    yield get_client()[_db_name()]["links"]
-
@@ -3,41 +3,47 @@
 import os
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
-from dataclasses import asdict
 from datetime import UTC, datetime
+from urllib.parse import quote
 
 from fastapi import Depends, FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, RedirectResponse
+from fastapi.responses import ORJSONResponse, Response
 from motor.motor_asyncio import AsyncIOMotorCollection
 
+from src.adapters.cache import TTLCache
 from src.adapters.db.repository import LinkRepository
 from src.adapters.db.session import init_db
 from src.api.deps import (
     get_base_url,
     get_db,
     get_edit_token,
-    get_permanent_cache_seconds,
+    get_redirect_cache,
     get_token_pepper,
+    permanent_cache_seconds,
 )
+from src.api.middleware import BodySizeLimitMiddleware, HealthCheckMiddleware
 from src.api.schemas import (
     CreateLinkRequest,
     CreateLinkResponse,
     LinkOut,
     UpdateLinkRequest,
 )
+from src.domain.entities import RedirectTarget
 from src.domain.errors import (
     ConflictError,
     GenerationError,
+    GoneError,
     NotFoundError,
+    UnauthorizedError,
     ValidationError,
 )
 from src.domain.id_token import (
     LINK_ID_GENERATION_MAX_ATTEMPTS,
     generate_edit_token,
-    generate_link_id_candidate,
+    generate_link_id_candidates,
     hash_token,
-    verify_token,
+    legacy_hash_token,
 )
 from src.domain.validators import (
     normalize_link_id,
@@ -82,9 +88,14 @@ app = FastAPI(
     ),
     openapi_tags=openapi_tags,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 
+app.add_middleware(BodySizeLimitMiddleware)
+# Registered before CORS so it sits inside it: probes skip routing, browsers still get CORS headers
+app.add_middleware(HealthCheckMiddleware)
+
 # Enable CORS for local UI development (configure origins via ALLOW_ORIGINS, comma-separated)
 _origins = os.getenv("ALLOW_ORIGINS", "http://localhost:5173,http://127.0.0.1:5173").split(",")
 app.add_middleware(
@@ -102,9 +113,17 @@ async def health() -> dict[str, str]:
     return {"status": "ok"}
 
 
+_PERMANENT_REDIRECT_CODES = frozenset({301, 308})
+_NO_STORE = "no-store"
+_LOCATION_SAFE_CHARS = ":/%#?=@[]!$&'()*+,;"
+# Resolved once at import rather than as a per-request dependency
+_PERMANENT_CACHE_CONTROL = f"public, max-age={permanent_cache_seconds()}, immutable"
+
+
 @app.api_route(
     "/{link_id}",
     methods=["GET", "HEAD"],
+    response_class=Response,
     tags=["Redirect"],
     summary="Redirect by short ID",
     description=(
@@ -115,53 +134,60 @@ async def health() -> dict[str, str]:
 async def redirect_link(
     link_id: str,
     db: AsyncIOMotorCollection = Depends(get_db),
-    permanent_cache_seconds: int = Depends(get_permanent_cache_seconds),
+    cache: TTLCache[str, RedirectTarget] = Depends(get_redirect_cache),
 ):
     """Redirect to the target URL based on stored link configuration.
 
     Returns 404 if link not found, 410 if deleted or expired. Applies cache headers:
     - 301/308: Cache-Control with max-age (configurable) & immutable hint
     - 302/307: no-store
-    """
-    repo = LinkRepository(db)
-    try:
-        link = await repo.get(link_id)
-    except NotFoundError as exc:
-        raise HTTPException(status_code=404, detail="not found") from exc
 
-    # Deleted or inactive
-    if not link.active:
-        raise HTTPException(status_code=410, detail="gone")
-    # Expired
-    if link.expires_at and link.expires_at <= datetime.now(UTC):
+    Lookups go through the in-process redirect cache; expiry is still checked
+    on every hit since the cached entry carries expires_at.
+    """
+    link = cache.get(link_id)
+    if link is None:
+        repo = LinkRepository(db)
+        try:
+            link = await repo.get_for_redirect(link_id)
+        except NotFoundError as exc:
+            raise HTTPException(status_code=404, detail="not found") from exc
+        except GoneError as exc:
+            raise HTTPException(status_code=410, detail="gone") from exc
+        cache.set(link_id, link)
+    # A cached entry may have expired since it was stored
+    elif link.expires_at and link.expires_at <= datetime.now(UTC):
+        cache.invalidate(link_id)
         raise HTTPException(status_code=410, detail="gone")
 
-    headers: dict[str, str] = {}
-    if link.redirect_code in (301, 308):
-        headers["Cache-Control"] = f"public, max-age={permanent_cache_seconds}, immutable"
+    if link.redirect_code in _PERMANENT_REDIRECT_CODES:
+        cache_control = _PERMANENT_CACHE_CONTROL
     else:
-        headers["Cache-Control"] = "no-store"
-    return RedirectResponse(
-        url=link.target_url,
+        cache_control = _NO_STORE
+    # Same Location quoting as RedirectResponse, without its per-call setup
+    return Response(
         status_code=link.redirect_code,
-        headers=headers
+        headers={
+            "location": quote(link.target_url, safe=_LOCATION_SAFE_CHARS),
+            "cache-control": cache_control,
+        },
     )
 
 
 @app.exception_handler(ValidationError)
 async def handle_validation_error(
     _req: Request, exc: ValidationError
-) -> JSONResponse:
+) -> ORJSONResponse:
     """Map domain ValidationError to HTTP 400 JSON response."""
-    return JSONResponse(status_code=400, content={"detail": str(exc)})
+    return ORJSONResponse(status_code=400, content={"detail": str(exc)})
 
 
 @app.exception_handler(GenerationError)
 async def handle_generation_error(
     _req: Request, exc: GenerationError
-) -> JSONResponse:
+) -> ORJSONResponse:
     """Map exhausted generated-ID retries to HTTP 500 JSON response."""
-    return JSONResponse(status_code=500, content={"detail": str(exc)})
+    return ORJSONResponse(status_code=500, content={"detail": str(exc)})
 
 
 @app.post(
@@ -195,9 +221,7 @@ async def create_link(
     if payload.link_id:
         link_id = normalize_link_id(payload.link_id)
         validate_link_id(link_id)
-        if await repo.exists(link_id):
-            raise HTTPException(
-                status_code=409, detail="link_id already taken")
+        # The unique index rejects duplicates; no separate existence probe
         try:
             link = await repo.create(
                 link_id=link_id,
@@ -209,19 +233,15 @@ async def create_link(
             raise HTTPException(
                 status_code=409, detail="link_id already taken") from exc
     else:
-        for _ in range(LINK_ID_GENERATION_MAX_ATTEMPTS):
-            try:
-                link = await repo.create(
-                    link_id=generate_link_id_candidate(),
-                    target_url=target_url,
-                    redirect_code=redirect_code,
-                    edit_token_hash=edit_token_hash,
-                )
-                break
-            except ConflictError:
-                continue
-        else:
-            raise GenerationError("failed to generate unique link id")
+        try:
+            link = await repo.create_first_available(
+                generate_link_id_candidates(LINK_ID_GENERATION_MAX_ATTEMPTS),
+                target_url=target_url,
+                redirect_code=redirect_code,
+                edit_token_hash=edit_token_hash,
+            )
+        except ConflictError as exc:
+            raise GenerationError("failed to generate unique link id") from exc
 
     short_url = f"{base_url.rstrip('/')}/{link.link_id}"
     return CreateLinkResponse(
@@ -254,7 +274,7 @@ async def get_link(
     if not link.active or (link.expires_at and link.expires_at <= datetime.now(UTC)):
         raise HTTPException(status_code=410, detail="gone")
 
-    return LinkOut(**asdict(link))
+    return LinkOut.model_validate(link)
 
 
 @app.patch(
@@ -267,12 +287,14 @@ async def get_link(
         "Requires a valid edit token. Old alias is tombstoned (returns 410)."
     ),
 )
-async def update_link(
+async def update_link(  # noqa: PLR0913
     link_id: str,
     payload: UpdateLinkRequest,
+    *,
     db: AsyncIOMotorCollection = Depends(get_db),
     pepper: str | None = Depends(get_token_pepper),
     edit_token: str = Depends(get_edit_token),
+    cache: TTLCache[str, RedirectTarget] = Depends(get_redirect_cache),
 ) -> LinkOut:
     """Update target_url/redirect_code or optionally change alias; requires edit token.
 
@@ -281,47 +303,57 @@ async def update_link(
     """
     repo = LinkRepository(db)
 
-    # fetch link to access stored hash
-    try:
-        current = await repo.get(link_id)
-    except NotFoundError as exc:
-        raise HTTPException(status_code=404, detail="Link not found") from exc
-
-    if not verify_token(edit_token, current.edit_token_hash, pepper=pepper):
-        raise HTTPException(status_code=403, detail="invalid edit token")
-
-    # Apply validations
+    # Validate first: the token and existence checks happen in the write itself,
+    # so an invalid body is a 400 even for a bad token or a missing link
     new_target = normalize_url(
         payload.target_url) if payload.target_url else None
     new_code = payload.redirect_code
     if new_code is not None:
         validate_redirect_code(new_code)
 
-    # Alias change
+    token_hash = hash_token(edit_token, pepper=pepper)
+    legacy_hash = legacy_hash_token(edit_token, pepper=pepper)
+
+    # Alias change: field updates are folded into the cloned document
     if payload.new_link_id:
         new_alias = normalize_link_id(payload.new_link_id)
         validate_link_id(new_alias)
-        if await repo.exists(new_alias):
-            raise HTTPException(
-                status_code=409, detail="new_link_id already taken")
         try:
-            updated = await repo.change_id(link_id, new_alias)
+            updated = await repo.change_id(
+                link_id,
+                new_alias,
+                edit_token_hash=token_hash,
+                legacy_token_hash=legacy_hash,
+                target_url=new_target,
+                redirect_code=new_code,
+            )
         except NotFoundError as exc:
             raise HTTPException(
                 status_code=404, detail="Link not found") from exc
-        link_id = updated.link_id
+        except UnauthorizedError as exc:
+            raise HTTPException(status_code=403, detail="invalid edit token") from exc
+        except ConflictError as exc:
+            raise HTTPException(
+                status_code=409, detail="new_link_id already taken") from exc
+        cache.invalidate(link_id, new_alias)
+        return LinkOut.model_validate(updated)
 
-    # Partial update
+    # Partial update; token verification is part of the update filter
     try:
-        updated = await repo.update(
+        updated = await repo.update_authorized(
             link_id,
+            token_hash,
+            legacy_token_hash=legacy_hash,
             target_url=new_target,
             redirect_code=new_code,
         )
     except NotFoundError as exc:
         raise HTTPException(status_code=404, detail="Link not found") from exc
+    except UnauthorizedError as exc:
+        raise HTTPException(status_code=403, detail="invalid edit token") from exc
+    cache.invalidate(link_id)
 
-    return LinkOut(**asdict(updated))
+    return LinkOut.model_validate(updated)
 
 
 @app.delete(
@@ -338,21 +370,21 @@ async def delete_link(
     db: AsyncIOMotorCollection = Depends(get_db),
     pepper: str | None = Depends(get_token_pepper),
     edit_token: str = Depends(get_edit_token),
+    cache: TTLCache[str, RedirectTarget] = Depends(get_redirect_cache),
 ) -> dict[str, str]:
     """Soft-delete a link by marking it inactive; requires a valid edit token."""
     repo = LinkRepository(db)
-    # Fetch and verify token
+    # Soft-delete; token verification is part of the update filter
     try:
-        current = await repo.get(link_id)
+        link = await repo.update_authorized(
+            link_id,
+            hash_token(edit_token, pepper=pepper),
+            legacy_token_hash=legacy_hash_token(edit_token, pepper=pepper),
+            active=False,
+        )
     except NotFoundError as exc:
         raise HTTPException(status_code=404, detail="Link not found") from exc
-
-    if not verify_token(edit_token, current.edit_token_hash, pepper=pepper):
-        raise HTTPException(status_code=403, detail="invalid edit token")
-
-    # Soft-delete
-    try:
-        link = await repo.update(link_id, active=False)
-    except NotFoundError as exc:  # should not happen if get succeeded
-        raise HTTPException(status_code=404, detail="Link not found") from exc
+    except UnauthorizedError as exc:
+        raise HTTPException(status_code=403, detail="invalid edit token") from exc
+    cache.invalidate(link_id)
     return {"status": "deleted", "link_id": link.link_id}
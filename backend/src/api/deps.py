@@ -1,31 +1,65 @@
-"""FastAPI dependencies for DB collection access and configuration."""
+"""FastAPI dependencies for DB collection access and configuration.
+
+Dependencies are coroutines even when they do no I/O: FastAPI runs plain
+``def`` dependencies in the threadpool, which would cost a thread hop per
+request on the redirect path.
+"""
 
 import os
-from collections.abc import AsyncIterator
 
 from fastapi import Header, HTTPException
 from motor.motor_asyncio import AsyncIOMotorCollection
 
-from src.adapters.db.session import get_db as _get_db
+from src.adapters.cache import TTLCache
+from src.adapters.db.session import get_collection
+from src.domain.entities import RedirectTarget
+
+
+async def get_db() -> AsyncIOMotorCollection:
+    """Return the shared MongoDB links collection.
+
+    A plain coroutine rather than a generator dependency: there is nothing to
+    tear down per request, so FastAPI can skip the exit-stack bookkeeping.
+    """
+    return get_collection()
+
+
+def _redirect_cache_from_env() -> TTLCache[str, RedirectTarget]:
+    try:
+        maxsize = max(int(os.getenv("REDIRECT_CACHE_SIZE", "100000")), 0)
+        ttl = max(float(os.getenv("REDIRECT_CACHE_TTL_SECONDS", "5")), 0.0)
+    except ValueError:
+        maxsize, ttl = 100_000, 5.0
+    return TTLCache(maxsize=maxsize, ttl=ttl)
+
 
+# Process-wide; mutations in this process invalidate eagerly, other workers
+# converge within the TTL. The 5 s default is the write-to-cache consistency
+# bound from the requirements; it also caps how long a lookup that raced an
+# update can re-populate a stale entry after invalidation.
+_redirect_cache = _redirect_cache_from_env()
 
-async def get_db() -> AsyncIterator[AsyncIOMotorCollection]:
-    """Yield the MongoDB links collection for request lifespan."""
-    async for collection in _get_db():
-        yield collection
 
+async def get_redirect_cache() -> TTLCache[str, RedirectTarget]:
+    """Shared in-process cache of redirect lookups keyed by link_id."""
+    return _redirect_cache
 
-def get_base_url() -> str:
+
+async def get_base_url() -> str:
     """Base URL for constructing short URLs (defaults to http://localhost:8000)."""
     return os.getenv("BASE_URL", "http://localhost:8000")
 
 
-def get_token_pepper() -> str | None:
+# Read once: the pepper is fixed for the process lifetime
+_TOKEN_PEPPER = os.getenv("TOKEN_PEPPER")
+
+
+async def get_token_pepper() -> str | None:
     """Optional server-side pepper for edit-token hashing."""
-    return os.getenv("TOKEN_PEPPER")
+    return _TOKEN_PEPPER
 
 
-def get_permanent_cache_seconds() -> int:
+def permanent_cache_seconds() -> int:
     """Cache max-age (seconds) for permanent redirects (301/308). Default 86400 (1 day)."""
     val = os.getenv("PERMANENT_CACHE_SECONDS", "86400")
     try:
@@ -35,7 +69,7 @@ def get_permanent_cache_seconds() -> int:
         return 86400
 
 
-def get_edit_token(x_edit_token: str | None = Header(default=None)) -> str:
+async def get_edit_token(x_edit_token: str | None = Header(default=None)) -> str:
     """Extract edit token from X-Edit-Token header; 401 if missing."""
     if not x_edit_token:
         raise HTTPException(status_code=401, detail="Missing or invalid X-Edit-Token header")
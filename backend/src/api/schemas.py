@@ -2,7 +2,7 @@
 
 from datetime import datetime
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class CreateLinkRequest(BaseModel):
@@ -30,6 +30,9 @@ class UpdateLinkRequest(BaseModel):
 
 class LinkOut(BaseModel):
     """Canonical link representation returned by read APIs."""
+    # Read straight from the slotted Link entity instead of an asdict() copy
+    model_config = ConfigDict(from_attributes=True)
+
     link_id: str
     target_url: str
     redirect_code: int
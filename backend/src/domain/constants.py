@@ -1,12 +1,13 @@
 """Domain constants and configuration defaults."""
 
-import re
+import string
 from typing import Final
 
 # Allowed custom link-id pattern: ^[A-Za-z0-9_-]{1,32}$ per requirements, normalized to lowercase
-LINK_ID_PATTERN: Final[re.Pattern[str]] = re.compile(r"^[A-Za-z0-9_-]{1,32}$")
+LINK_ID_ALLOWED_CHARS: Final[str] = string.ascii_letters + string.digits + "_-"
+LINK_ID_MAX_LENGTH: Final[int] = 32
 
-RESERVED_LINK_IDS: Final[set[str]] = {
+RESERVED_LINK_IDS: Final[frozenset[str]] = frozenset({
     "api",
     "admin",
     "mgnt",
@@ -15,10 +16,10 @@ RESERVED_LINK_IDS: Final[set[str]] = {
     "health",
     "metrics",
     "static",
-}
+})
 
 # Permitted redirect codes
-ALLOWED_REDIRECT_CODES: Final[set[int]] = {301, 302, 307, 308}
+ALLOWED_REDIRECT_CODES: Final[frozenset[int]] = frozenset({301, 302, 307, 308})
 
 # Specific well-known HTTP status codes used in the domain
 HTTP_308_PERMANENT_REDIRECT: Final[int] = 308
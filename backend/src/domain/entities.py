@@ -15,3 +15,11 @@ class Link:
     edit_token_hash: str
     active: bool = True
     expires_at: datetime | None = None
+
+
+@dataclass(slots=True)
+class RedirectTarget:
+    """Subset of a live (active, unexpired) Link needed to serve a redirect."""
+    target_url: str
+    redirect_code: int
+    expires_at: datetime | None = None
@@ -3,40 +3,123 @@
 import hashlib
 import secrets
 import string
+from functools import lru_cache
+from hmac import compare_digest
 
 LINK_ID_GENERATION_MAX_ATTEMPTS = 5
 
 
+def generate_link_id_candidates(count: int = LINK_ID_GENERATION_MAX_ATTEMPTS) -> list[str]:
+    """Return ``count`` random 6-character lowercase hexadecimal candidate IDs.
+
+    All candidates come from a single ``secrets.token_bytes`` draw.
+    """
+    raw = secrets.token_bytes(3 * count).hex()
+    return [raw[i : i + 6] for i in range(0, 6 * count, 6)]
+
+
 def generate_link_id_candidate() -> str:
     """Return a random 6-character lowercase hexadecimal candidate ID."""
-    return secrets.token_hex(3)
+    return generate_link_id_candidates(1)[0]
 
 
 _ALPHANUM = string.ascii_letters + string.digits
 
+# Random bytes map to the alphabet through their low 6 bits. Values 62 and 63
+# have no character and are dropped (rejection sampling), so every character
+# stays equally likely.
+_TOKEN_TABLE = bytes(
+    ord(_ALPHANUM[b & 0x3F]) if (b & 0x3F) < len(_ALPHANUM) else 0 for b in range(256)
+)
+_TOKEN_REJECT = bytes(b for b in range(256) if (b & 0x3F) >= len(_ALPHANUM))
+
 
 def generate_edit_token(length: int = 24) -> str:
     """Generate a high-entropy token consisting of [A-Za-z0-9].
 
+    Draws all randomness with one ``secrets.token_bytes`` call in the common
+    case and maps it with ``bytes.translate``.
+
     Args:
         length: The length of the token to generate. Defaults to 24.
 
     Returns:
         str: Random string using only ASCII letters and digits (A-Za-z0-9).
     """
-    return "".join(secrets.choice(_ALPHANUM) for _ in range(length))
+    out = b""
+    while len(out) < length:
+        # ~3% of bytes are rejected; a little oversampling avoids a second draw
+        out += secrets.token_bytes(length + 8).translate(_TOKEN_TABLE, _TOKEN_REJECT)
+    return out[:length].decode("ascii")
+
+
+@lru_cache(maxsize=4)
+def _pepper_bytes(pepper: str) -> bytes:
+    return pepper.encode("utf-8")
+
+
+# Both digests are 32 bytes, i.e. 64 hex chars, so stored values keep one shape
+_HEX_DIGEST_LENGTH = 64
+_BLAKE2B_DIGEST_SIZE = 32
+# SHA-256 compresses input in 64-byte blocks
+_SHA256_BLOCK_SIZE = 64
+
+
+@lru_cache(maxsize=4)
+def _pepper_key(pepper: str) -> bytes:
+    key = _pepper_bytes(pepper)
+    if len(key) > hashlib.blake2b.MAX_KEY_SIZE:
+        # BLAKE2b keys are at most 64 bytes; compress longer peppers into one
+        key = hashlib.blake2b(key).digest()
+    return key
 
 
 def _compute_hash(token: str, pepper: str | None) -> str:
-    h = hashlib.sha256()
-    if pepper:
-        h.update(pepper.encode("utf-8"))
-    h.update(token.encode("utf-8"))
+    # Keyed BLAKE2b is a MAC on its own: the pepper is the key, no prefixing
+    key = _pepper_key(pepper) if pepper else b""
+    return hashlib.blake2b(
+        token.encode("utf-8"), digest_size=_BLAKE2B_DIGEST_SIZE, key=key
+    ).hexdigest()
+
+
+@lru_cache(maxsize=4)
+def _pepper_state(pepper: str) -> "hashlib._Hash":
+    return hashlib.sha256(_pepper_bytes(pepper))
+
+
+def _compute_legacy_hash(token: str, pepper: str | None) -> str:
+    data = token.encode("utf-8")
+    if not pepper:
+        return hashlib.sha256(data).hexdigest()
+    pepper_bytes = _pepper_bytes(pepper)
+    if len(pepper_bytes) < _SHA256_BLOCK_SIZE:
+        # No full pepper block to precompute; one constructor call is cheapest
+        return hashlib.sha256(pepper_bytes + data).hexdigest()
+    # Long pepper: resume from the cached midstate so its full blocks are
+    # compressed once per process rather than on every call.
+    h = _pepper_state(pepper).copy()
+    h.update(data)
     return h.hexdigest()
 
 
 def hash_token(token: str, pepper: str | None = None) -> str:
-    """Compute a SHA-256 hash of the token (optionally prepended with pepper).
+    """Compute a keyed BLAKE2b-256 hash of the token.
+
+    Args:
+        token (str): The token to hash.
+        pepper (str | None, optional): Optional secret value used as the BLAKE2b key.
+
+    Returns:
+        str: A 64-character lowercase hexadecimal string representing the hash.
+    """
+    return _compute_hash(token, pepper)
+
+
+def legacy_hash_token(token: str, pepper: str | None = None) -> str:
+    """Compute the pre-BLAKE2b SHA-256 hash of the token (pepper prepended).
+
+    Links created before the switch still store this form; it is accepted
+    alongside ``hash_token`` and replaced on the next authorized write.
 
     Args:
         token (str): The token to hash.
@@ -45,7 +128,7 @@ def hash_token(token: str, pepper: str | None = None) -> str:
     Returns:
         str: A 64-character lowercase hexadecimal string representing the SHA-256 hash.
     """
-    return _compute_hash(token, pepper)
+    return _compute_legacy_hash(token, pepper)
 
 
 def verify_token(token: str, token_hash: str, pepper: str | None = None) -> bool:
@@ -53,14 +136,20 @@ def verify_token(token: str, token_hash: str, pepper: str | None = None) -> bool
 
     Args:
         token (str): The plaintext token to verify.
-        token_hash (str): The expected hex-encoded SHA-256 hash to compare against.
-        pepper (str | None): Optional secret value to prepend to the token before hashing.
+        token_hash (str): The stored hex hash, in current or legacy form.
+        pepper (str | None): Optional secret value used when hashing the token.
 
     Returns:
         bool: True if the token matches the hash, False otherwise.
 
     Security:
-        Uses constant-time comparison to prevent timing attacks.
+        Uses constant-time comparison to prevent timing attacks. A stored hash of
+        the wrong length is rejected before hashing; that length is a property of
+        the stored format, not of any secret.
     """
-    expected = _compute_hash(token, pepper)
-    return secrets.compare_digest(expected, token_hash)
+    if len(token_hash) != _HEX_DIGEST_LENGTH:
+        return False
+    # Non-short-circuiting "|" so both comparisons always run
+    return compare_digest(_compute_hash(token, pepper), token_hash) | compare_digest(
+        _compute_legacy_hash(token, pepper), token_hash
+    )
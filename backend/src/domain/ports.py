@@ -4,10 +4,11 @@ Inner-layer contracts that adapters must fulfil. Defined as Protocols so
 concrete implementations require no explicit inheritance.
 """
 
+from collections.abc import Sequence
 from datetime import datetime
 from typing import Protocol
 
-from .entities import Link
+from .entities import Link, RedirectTarget
 
 
 class LinkRepositoryPort(Protocol):
@@ -20,10 +21,18 @@ class LinkRepositoryPort(Protocol):
         """Fetch a link by ID or raise NotFoundError."""
         ...
 
+    async def get_for_redirect(self, link_id: str) -> RedirectTarget:
+        """Fetch a live link's redirect fields; raise NotFoundError or GoneError."""
+        ...
+
     async def exists(self, link_id: str) -> bool:
         """Return True if a link with the given ID exists."""
         ...
 
+    async def taken_ids(self, link_ids: Sequence[str]) -> set[str]:
+        """Return the subset of the given IDs that already exist."""
+        ...
+
     async def create(  # noqa: PLR0913
         self,
         link_id: str,
@@ -36,6 +45,16 @@ class LinkRepositoryPort(Protocol):
         """Persist a new link; raise ConflictError if link_id already exists."""
         ...
 
+    async def create_first_available(
+        self,
+        candidates: Sequence[str],
+        target_url: str,
+        redirect_code: int,
+        edit_token_hash: str,
+    ) -> Link:
+        """Persist a new link under the first free candidate; raise ConflictError if none."""
+        ...
+
     async def update(  # noqa: PLR0913
         self,
         link_id: str,
@@ -49,6 +68,28 @@ class LinkRepositoryPort(Protocol):
         """Update mutable fields; raise NotFoundError if link not found."""
         ...
 
-    async def change_id(self, old_id: str, new_id: str) -> Link:
-        """Tombstone old alias and create a new one; raise Conflict/NotFound as needed."""
+    async def update_authorized(  # noqa: PLR0913
+        self,
+        link_id: str,
+        edit_token_hash: str,
+        *,
+        legacy_token_hash: str | None = None,
+        target_url: str | None = None,
+        redirect_code: int | None = None,
+        active: bool | None = None,
+    ) -> Link:
+        """Update fields if the token hash matches; raise NotFound/Unauthorized."""
+        ...
+
+    async def change_id(  # noqa: PLR0913
+        self,
+        old_id: str,
+        new_id: str,
+        *,
+        edit_token_hash: str | None = None,
+        legacy_token_hash: str | None = None,
+        target_url: str | None = None,
+        redirect_code: int | None = None,
+    ) -> Link:
+        """Tombstone old alias and create a new one; raise Conflict/NotFound/Unauthorized."""
         ...
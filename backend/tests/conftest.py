@@ -1,34 +1,65 @@
 """Pytest fixtures for MongoDB-backed tests using mongomock-motor."""
 
-from collections.abc import AsyncIterator
+import asyncio
+from collections.abc import AsyncIterator, Iterator
 
 import pytest
 import pytest_asyncio
 from mongomock_motor import AsyncMongoMockClient
 from motor.motor_asyncio import AsyncIOMotorCollection
 
+from src.adapters.cache import TTLCache
+from src.adapters.db.repository import LinkRepository
 from src.api.app import app
-from src.api.deps import get_db
+from src.api.deps import get_db, get_redirect_cache
+from src.domain.entities import RedirectTarget
+
+
+@pytest.fixture(scope="session")
+def mongo_session_collection() -> AsyncIOMotorCollection:  # type: ignore[type-arg]
+    """Create the in-process mock links collection and its index once per session."""
+    collection = AsyncMongoMockClient()["tinyurl"]["links"]
+    # Unique index mirrors production setup. mongomock-motor coroutines do not
+    # bind to an event loop, so a throwaway loop is enough here.
+    asyncio.run(collection.create_index("link_id", unique=True))
+    return collection
 
 
 @pytest_asyncio.fixture
-async def mongo_collection() -> AsyncIterator[AsyncIOMotorCollection]:  # type: ignore[type-arg]
-    """Yield an in-process mock MongoDB links collection, cleared between tests."""
-    client = AsyncMongoMockClient()
-    collection = client["tinyurl"]["links"]
-    # Unique index mirrors production setup
-    await collection.create_index("link_id", unique=True)
-    yield collection
-    await collection.drop()
+async def mongo_collection(
+    mongo_session_collection: AsyncIOMotorCollection,  # type: ignore[type-arg]
+) -> AsyncIterator[AsyncIOMotorCollection]:  # type: ignore[type-arg]
+    """Yield the shared mock links collection, emptied after each test (index kept)."""
+    yield mongo_session_collection
+    await mongo_session_collection.delete_many({})
+
+
+@pytest.fixture
+def repo(mongo_collection: AsyncIOMotorCollection) -> LinkRepository:  # type: ignore[type-arg]
+    """Provide a LinkRepository bound to the per-test links collection."""
+    return LinkRepository(mongo_collection)
 
 
 @pytest.fixture(autouse=False)
 def override_db(mongo_collection: AsyncIOMotorCollection):  # type: ignore[type-arg]
     """Override the FastAPI get_db dependency to use the test collection."""
 
-    async def _get_test_db() -> AsyncIterator[AsyncIOMotorCollection]:  # type: ignore[type-arg]
-        yield mongo_collection
+    async def _get_test_db() -> AsyncIOMotorCollection:  # type: ignore[type-arg]
+        return mongo_collection
 
     app.dependency_overrides[get_db] = _get_test_db
     yield
     app.dependency_overrides.pop(get_db, None)
+
+
+@pytest.fixture
+def redirect_cache() -> Iterator[TTLCache[str, RedirectTarget]]:
+    """Override the shared redirect cache with a fresh per-test instance."""
+    cache: TTLCache[str, RedirectTarget] = TTLCache(maxsize=128, ttl=60)
+
+    async def _get_test_cache() -> TTLCache[str, RedirectTarget]:
+        return cache
+
+    app.dependency_overrides[get_redirect_cache] = _get_test_cache
+    yield cache
+    app.dependency_overrides.pop(get_redirect_cache, None)
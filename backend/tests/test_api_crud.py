@@ -1,24 +1,60 @@
 """API integration tests for CRUD + redirect using async httpx client."""
 
+import asyncio
+from collections.abc import AsyncIterator, Iterator, Sequence
+from typing import Any
+
 import httpx
 import pytest
-import pytest_asyncio
 
 import src.api.app as api_app_module
+from src.adapters.cache import TTLCache
+from src.adapters.db.repository import LinkRepository
 from src.api.app import app
+from src.api.deps import get_token_pepper
+from src.api.middleware import MAX_REQUEST_BODY_BYTES
+from src.domain.entities import RedirectTarget
+
+
+@pytest.fixture(scope="module")
+def shared_client() -> Iterator[httpx.AsyncClient]:
+    """One AsyncClient for the module; ASGITransport holds no loop-bound state."""
+    ac = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver")
+    yield ac
+    asyncio.run(ac.aclose())
 
 
-@pytest_asyncio.fixture(name="client")
-async def _client_fixture(
+@pytest.fixture(name="client")
+def _client_fixture(
+    shared_client: httpx.AsyncClient,
     override_db: None,
+    redirect_cache: TTLCache[str, RedirectTarget],
     monkeypatch: pytest.MonkeyPatch,
-) -> httpx.AsyncClient:
-    """Provide an AsyncClient with ASGITransport backed by a mock MongoDB collection."""
+) -> Iterator[httpx.AsyncClient]:
+    """Provide the shared AsyncClient with per-test DB/cache/pepper overrides and env."""
     monkeypatch.setenv("BASE_URL", "http://testserver")
-    monkeypatch.delenv("TOKEN_PEPPER", raising=False)
-    transport = httpx.ASGITransport(app=app)
-    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as ac:
-        yield ac
+
+    # The pepper is read at import, so TOKEN_PEPPER in the shell cannot be
+    # unset here; pin it through the dependency instead.
+    async def _no_pepper() -> str | None:
+        return None
+
+    app.dependency_overrides[get_token_pepper] = _no_pepper
+    yield shared_client
+    app.dependency_overrides.pop(get_token_pepper, None)
+
+
+@pytest.mark.asyncio
+async def test_health_returns_ok(client: httpx.AsyncClient) -> None:
+    """Health probe answers 200 with a JSON status body for GET and HEAD."""
+    r = await client.get("/api/health")
+    assert r.status_code == 200
+    assert r.json() == {"status": "ok"}
+    assert r.headers["content-type"] == "application/json"
+
+    head = await client.head("/api/health")
+    assert head.status_code == 200
+    assert head.content == b""
 
 
 @pytest.mark.asyncio
@@ -118,11 +154,10 @@ async def test_generated_id_insert_conflict_retries_success(
     )
     assert seed.status_code == 200
 
-    candidates = iter(["deadbe", "b16b00"])
     monkeypatch.setattr(
         api_app_module,
-        "generate_link_id_candidate",
-        lambda: next(candidates),
+        "generate_link_id_candidates",
+        lambda count: ["deadbe", "b16b00", "c0ffee", "facade", "decade"][:count],
     )
 
     created = await client.post(
@@ -145,14 +180,25 @@ async def test_generated_id_retry_exhaustion_returns_500(
     )
     assert seed.status_code == 200
 
-    attempts = 0
+    monkeypatch.setattr(
+        api_app_module, "generate_link_id_candidates", lambda count: ["ffffff"] * count
+    )
+
+    inserted: list[str] = []
+    screened: list[list[str]] = []
+    original_create = LinkRepository.create
+    original_taken_ids = LinkRepository.taken_ids
+
+    async def spy_create(self: LinkRepository, link_id: str, *args: Any, **kwargs: Any) -> Any:
+        inserted.append(link_id)
+        return await original_create(self, link_id, *args, **kwargs)
 
-    def always_conflict() -> str:
-        nonlocal attempts
-        attempts += 1
-        return "ffffff"
+    async def spy_taken_ids(self: LinkRepository, link_ids: Sequence[str]) -> set[str]:
+        screened.append(list(link_ids))
+        return await original_taken_ids(self, link_ids)
 
-    monkeypatch.setattr(api_app_module, "generate_link_id_candidate", always_conflict)
+    monkeypatch.setattr(LinkRepository, "create", spy_create)
+    monkeypatch.setattr(LinkRepository, "taken_ids", spy_taken_ids)
 
     failed = await client.post(
         "/api/links",
@@ -160,7 +206,9 @@ async def test_generated_id_retry_exhaustion_returns_500(
     )
     assert failed.status_code == 500
     assert failed.json()["detail"] == "failed to generate unique link id"
-    assert attempts == api_app_module.LINK_ID_GENERATION_MAX_ATTEMPTS
+    # One direct insert, then a single $in screen skips every remaining candidate
+    assert inserted == ["ffffff"]
+    assert screened == [["ffffff"] * (api_app_module.LINK_ID_GENERATION_MAX_ATTEMPTS - 1)]
 
 
 @pytest.mark.asyncio
@@ -183,6 +231,41 @@ async def test_invalid_token_on_delete(client: httpx.AsyncClient) -> None:
     assert r2.status_code == 403
 
 
+@pytest.mark.asyncio
+async def test_update_validates_body_before_token_and_existence(
+    client: httpx.AsyncClient,
+) -> None:
+    """PATCH rejects an invalid body with 400 before checking the token or the link.
+
+    Authorization and existence are decided by the write itself, so they are
+    only reached once the payload is valid.
+    """
+    r = await client.post("/api/links", json={"target_url": "https://example.com/"})
+    assert r.status_code == 200
+    link_id = r.json()["link_id"]
+
+    bad_token = await client.patch(
+        f"/api/links/{link_id}",
+        json={"target_url": "ftp://x"},
+        headers={"X-Edit-Token": "bad"},
+    )
+    assert bad_token.status_code == 400
+
+    missing = await client.patch(
+        "/api/links/no-such-link",
+        json={"redirect_code": 303},
+        headers={"X-Edit-Token": "bad"},
+    )
+    assert missing.status_code == 400
+
+    valid_body = await client.patch(
+        f"/api/links/{link_id}",
+        json={"target_url": "https://example.com/ok"},
+        headers={"X-Edit-Token": "bad"},
+    )
+    assert valid_body.status_code == 403
+
+
 @pytest.mark.asyncio
 async def test_redirect_permanent_cache_headers(client: httpx.AsyncClient) -> None:
     """Permanent redirects (301/308) should set cache headers with max-age and immutable."""
@@ -294,3 +377,100 @@ async def test_alias_change_tombstones_old_alias(client: httpx.AsyncClient) -> N
     new_redirect = await client.get(f"/{new_id}", follow_redirects=False)
     assert new_redirect.status_code == 302
     assert new_redirect.headers.get("Location") == "https://example.com/alias"
+
+
+@pytest.mark.asyncio
+async def test_redirect_cache_invalidated_on_update(
+    client: httpx.AsyncClient,
+    redirect_cache: TTLCache[str, RedirectTarget],
+) -> None:
+    """Redirects are cached after the first hit and dropped when the link changes."""
+    r = await client.post(
+        "/api/links",
+        json={"target_url": "https://example.com/before", "redirect_code": 302},
+    )
+    assert r.status_code == 200
+    link_id = r.json()["link_id"]
+    token = r.json()["edit_token"]
+
+    first = await client.get(f"/{link_id}", follow_redirects=False)
+    assert first.headers.get("Location") == "https://example.com/before"
+    assert redirect_cache.get(link_id) is not None
+
+    patch_resp = await client.patch(
+        f"/api/links/{link_id}",
+        headers={"X-Edit-Token": token},
+        json={"target_url": "https://example.com/after"},
+    )
+    assert patch_resp.status_code == 200
+    assert redirect_cache.get(link_id) is None
+
+    second = await client.get(f"/{link_id}", follow_redirects=False)
+    assert second.headers.get("Location") == "https://example.com/after"
+
+
+@pytest.mark.asyncio
+async def test_alias_change_to_taken_alias_returns_409(client: httpx.AsyncClient) -> None:
+    """Changing alias onto an existing link id returns 409 and keeps the old alias live."""
+    taken = await client.post(
+        "/api/links", json={"target_url": "https://example.com/t", "link_id": "taken"}
+    )
+    assert taken.status_code == 200
+    r = await client.post(
+        "/api/links",
+        json={"target_url": "https://example.com/s", "link_id": "source", "redirect_code": 302},
+    )
+    token = r.json()["edit_token"]
+
+    resp = await client.patch(
+        "/api/links/source",
+        headers={"X-Edit-Token": token},
+        json={"new_link_id": "taken", "target_url": "https://example.com/other"},
+    )
+    assert resp.status_code == 409
+
+    still = await client.get("/source", follow_redirects=False)
+    assert still.status_code == 302
+    assert still.headers.get("Location") == "https://example.com/s"
+
+
+@pytest.mark.asyncio
+async def test_alias_change_with_invalid_token_returns_403(client: httpx.AsyncClient) -> None:
+    """Alias change with a wrong token is rejected and the old alias keeps working."""
+    r = await client.post(
+        "/api/links",
+        json={"target_url": "https://example.com/k", "link_id": "keep", "redirect_code": 302},
+    )
+    assert r.status_code == 200
+
+    resp = await client.patch(
+        "/api/links/keep",
+        headers={"X-Edit-Token": "bad"},
+        json={"new_link_id": "stolen"},
+    )
+    assert resp.status_code == 403
+    assert (await client.get("/keep", follow_redirects=False)).status_code == 302
+    assert (await client.get("/api/links/stolen")).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_oversized_body_returns_413(client: httpx.AsyncClient) -> None:
+    """Bodies over the size limit are rejected before JSON parsing or validation."""
+    huge = "https://example.com/" + "a" * (MAX_REQUEST_BODY_BYTES + 1)
+    r = await client.post("/api/links", json={"target_url": huge})
+    assert r.status_code == 413
+    assert r.json() == {"detail": "request body too large"}
+
+
+@pytest.mark.asyncio
+async def test_oversized_streamed_body_returns_413(client: httpx.AsyncClient) -> None:
+    """Bodies without Content-Length are counted while streaming."""
+
+    async def chunks() -> AsyncIterator[bytes]:
+        for _ in range(3):
+            yield b"x" * MAX_REQUEST_BODY_BYTES
+
+    r = await client.post(
+        "/api/links", content=chunks(), headers={"Content-Type": "application/json"}
+    )
+    assert r.status_code == 413
@@ -0,0 +1,45 @@
+"""Unit tests for the in-process TTL cache."""
+
+import pytest
+
+from src.adapters import cache as mod
+from src.adapters.cache import TTLCache
+
+
+def test_get_set_and_invalidate() -> None:
+    """Stored values are returned until invalidated."""
+    cache: TTLCache[str, int] = TTLCache(maxsize=4, ttl=60)
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    cache.invalidate("a", "missing")
+    assert cache.get("a") is None
+
+
+def test_evicts_least_recently_used() -> None:
+    """Exceeding maxsize evicts the entry touched longest ago."""
+    cache: TTLCache[str, int] = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # refresh "a"
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_entries_expire_after_ttl(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Entries older than ttl are treated as missing and dropped."""
+    now = 1000.0
+    monkeypatch.setattr(mod.time, "monotonic", lambda: now)
+    cache: TTLCache[str, int] = TTLCache(maxsize=4, ttl=10)
+    cache.set("a", 1)
+    now = 1010.0
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_zero_size_disables_cache() -> None:
+    """A zero maxsize never stores anything."""
+    cache: TTLCache[str, int] = TTLCache(maxsize=0, ttl=60)
+    cache.set("a", 1)
+    assert cache.get("a") is None
@@ -1,5 +1,7 @@
 """Unit tests for ID and token services."""
 
+import hashlib
+
 import pytest
 
 from src.domain import id_token as mod
@@ -7,7 +9,9 @@ from src.domain.id_token import (
     LINK_ID_GENERATION_MAX_ATTEMPTS,
     generate_edit_token,
     generate_link_id_candidate,
+    generate_link_id_candidates,
     hash_token,
+    legacy_hash_token,
     verify_token,
 )
 
@@ -24,19 +28,55 @@ def test_generate_link_id_candidate_uses_three_random_bytes(
 ) -> None:
     """Candidate generation should request exactly 3 random bytes (6 hex chars)."""
 
-    def fake_token_hex(n: int) -> str:
+    def fake_token_bytes(n: int) -> bytes:
         assert n == 3
-        return "abcdef"
+        return bytes.fromhex("abcdef")
 
-    monkeypatch.setattr(mod.secrets, "token_hex", fake_token_hex)
+    monkeypatch.setattr(mod.secrets, "token_bytes", fake_token_bytes)
     assert generate_link_id_candidate() == "abcdef"
 
 
+def test_generate_link_id_candidates_single_draw(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Batch generation slices one 3*count byte draw into 6-char hex IDs."""
+
+    def fake_token_bytes(n: int) -> bytes:
+        assert n == 9
+        return bytes.fromhex("abcdef012345deadbe")
+
+    monkeypatch.setattr(mod.secrets, "token_bytes", fake_token_bytes)
+    assert generate_link_id_candidates(3) == ["abcdef", "012345", "deadbe"]
+
+
+def test_generate_link_id_candidates_default_count() -> None:
+    """By default one candidate is produced per allowed attempt."""
+    candidates = generate_link_id_candidates()
+    assert len(candidates) == LINK_ID_GENERATION_MAX_ATTEMPTS
+    assert all(len(c) == 6 and all(ch in "0123456789abcdef" for ch in c) for c in candidates)
+
+
 def test_link_id_generation_retry_budget_matches_requirement() -> None:
     """Auto-generated IDs should retry collisions up to five times."""
     assert LINK_ID_GENERATION_MAX_ATTEMPTS == 5
 
 
+def test_generate_edit_token_alphabet_and_length() -> None:
+    """Tokens honour the requested length and only use [A-Za-z0-9]."""
+    allowed = set(mod._ALPHANUM)
+    for length in (1, 24, 200):
+        token = generate_edit_token(length)
+        assert len(token) == length
+        assert set(token) <= allowed
+
+
+def test_generate_edit_token_rejects_out_of_range_bytes(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Bytes whose low 6 bits are 62/63 are discarded, forcing another draw."""
+    draws = iter([b"\x3e\x3f\x00", b"\x01\x7f\x3d" + b"\x00" * 8])
+    monkeypatch.setattr(mod.secrets, "token_bytes", lambda n: next(draws))
+    assert generate_edit_token(3) == "ab9"
+
+
 def test_edit_token_hash_and_verify() -> None:
     """Verify hash/compare works without pepper."""
     token = generate_edit_token()
@@ -54,3 +94,51 @@ def test_edit_token_hash_and_verify_with_pepper() -> None:
     h = hash_token(token, pepper=pepper)
     assert verify_token(token, h, pepper=pepper)
     assert not verify_token(token, h, pepper=pepper + "x")
+
+
+def test_hash_token_is_keyed_blake2b() -> None:
+    """Current hashes are BLAKE2b-256 keyed with the pepper; long peppers are compressed."""
+    token = generate_edit_token()
+    pepper = "server-side-pepper"
+    expected = hashlib.blake2b(token.encode(), digest_size=32, key=pepper.encode()).hexdigest()
+    assert hash_token(token, pepper=pepper) == expected
+    assert hash_token(token) == hashlib.blake2b(token.encode(), digest_size=32).hexdigest()
+
+    long_pepper = "p" * 100
+    long_key = hashlib.blake2b(long_pepper.encode()).digest()
+    assert hash_token(token, pepper=long_pepper) == (
+        hashlib.blake2b(token.encode(), digest_size=32, key=long_key).hexdigest()
+    )
+
+
+def test_verify_token_accepts_legacy_sha256_hash() -> None:
+    """Hashes stored before the BLAKE2b switch still verify during rollover."""
+    token = generate_edit_token()
+    pepper = "server-side-pepper"
+    legacy = hashlib.sha256((pepper + token).encode("utf-8")).hexdigest()
+    assert legacy_hash_token(token, pepper=pepper) == legacy
+    assert verify_token(token, legacy, pepper=pepper)
+    assert not verify_token(token, legacy, pepper=pepper + "x")
+
+
+def test_legacy_hash_with_long_pepper_matches_plain_sha256() -> None:
+    """Peppers spanning whole SHA-256 blocks hash identically via the cached midstate."""
+    token = generate_edit_token()
+    pepper = "p" * 100
+    expected = hashlib.sha256((pepper + token).encode("utf-8")).hexdigest()
+    assert legacy_hash_token(token, pepper=pepper) == expected
+    assert legacy_hash_token(token, pepper=pepper) == expected  # reuses cached state
+    assert verify_token(token, expected, pepper=pepper)
+
+
+def test_verify_token_rejects_malformed_hash_without_hashing(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Stored hashes of the wrong length fail fast without computing a digest."""
+
+    def fail_compute(token: str, pepper: str | None) -> str:
+        raise AssertionError("should not hash")
+
+    monkeypatch.setattr(mod, "_compute_hash", fail_compute)
+    assert not verify_token("anything", "")
+    assert not verify_token("anything", "a" * 63)
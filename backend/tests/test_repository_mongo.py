@@ -1,20 +1,18 @@
 """Repository integration tests for MongoDB adapter."""
 
+from datetime import UTC, datetime, timedelta
+
 import pytest
 from motor.motor_asyncio import AsyncIOMotorCollection
 
-from src.adapters.db.repository import LinkRepository
+from src.adapters.db.repository import LinkRepository, _update_spec
 from src.domain.constants import HTTP_308_PERMANENT_REDIRECT
-from src.domain.errors import ConflictError, NotFoundError
+from src.domain.errors import ConflictError, GoneError, NotFoundError, UnauthorizedError
 
 
 @pytest.mark.asyncio
-async def test_create_get_update_change_id(
-    mongo_collection: AsyncIOMotorCollection,  # type: ignore[type-arg]
-) -> None:
+async def test_create_get_update_change_id(repo: LinkRepository) -> None:
     """End-to-end repository flow: create, get, update, change_id."""
-    repo = LinkRepository(mongo_collection)
-
     link = await repo.create(
         link_id="abc123",
         target_url="https://example.com",
@@ -44,21 +42,15 @@ async def test_create_get_update_change_id(
 
 
 @pytest.mark.asyncio
-async def test_get_not_found(
-    mongo_collection: AsyncIOMotorCollection,  # type: ignore[type-arg]
-) -> None:
+async def test_get_not_found(repo: LinkRepository) -> None:
     """Fetching missing link should raise NotFoundError."""
-    repo = LinkRepository(mongo_collection)
     with pytest.raises(NotFoundError):
         await repo.get("nope")
 
 
 @pytest.mark.asyncio
-async def test_create_conflict_and_change_id_conflict(
-    mongo_collection: AsyncIOMotorCollection,  # type: ignore[type-arg]
-) -> None:
+async def test_create_conflict_and_change_id_conflict(repo: LinkRepository) -> None:
     """Creating duplicate id and changing id to existing should raise ConflictError."""
-    repo = LinkRepository(mongo_collection)
     await repo.create(
         link_id="dup123",
         target_url="https://example.com/one",
@@ -84,10 +76,194 @@ async def test_create_conflict_and_change_id_conflict(
 
 
 @pytest.mark.asyncio
-async def test_update_not_found(
-    mongo_collection: AsyncIOMotorCollection,  # type: ignore[type-arg]
-) -> None:
+async def test_update_not_found(repo: LinkRepository) -> None:
     """Updating a non-existing id should raise NotFoundError."""
-    repo = LinkRepository(mongo_collection)
     with pytest.raises(NotFoundError):
         await repo.update("missing", target_url="https://example.com")
+
+
+@pytest.mark.asyncio
+async def test_get_for_redirect_returns_redirect_fields(repo: LinkRepository) -> None:
+    """Redirect lookup returns target and status; missing id raises NotFoundError."""
+    await repo.create(
+        link_id="redir1",
+        target_url="https://example.com/r",
+        redirect_code=HTTP_308_PERMANENT_REDIRECT,
+        edit_token_hash="a" * 64,
+    )
+
+    target = await repo.get_for_redirect("redir1")
+    assert target.target_url == "https://example.com/r"
+    assert target.redirect_code == HTTP_308_PERMANENT_REDIRECT
+    assert target.expires_at is None
+
+    with pytest.raises(NotFoundError):
+        await repo.get_for_redirect("missing")
+
+
+@pytest.mark.asyncio
+async def test_get_for_redirect_gone_when_inactive_or_expired(repo: LinkRepository) -> None:
+    """Inactive and expired links raise GoneError rather than NotFoundError."""
+    await repo.create(
+        link_id="expired",
+        target_url="https://example.com/old",
+        redirect_code=302,
+        edit_token_hash="b" * 64,
+        expires_at=datetime.now(UTC) - timedelta(minutes=1),
+    )
+    await repo.create(
+        link_id="inactive",
+        target_url="https://example.com/off",
+        redirect_code=302,
+        edit_token_hash="c" * 64,
+        active=False,
+    )
+    await repo.create(
+        link_id="future",
+        target_url="https://example.com/later",
+        redirect_code=302,
+        edit_token_hash="d" * 64,
+        expires_at=datetime.now(UTC) + timedelta(days=1),
+    )
+
+    with pytest.raises(GoneError):
+        await repo.get_for_redirect("expired")
+    with pytest.raises(GoneError):
+        await repo.get_for_redirect("inactive")
+    assert (await repo.get_for_redirect("future")).target_url == "https://example.com/later"
+
+
+@pytest.mark.asyncio
+async def test_update_authorized_checks_token_hash(repo: LinkRepository) -> None:
+    """Authorized update applies on hash match and distinguishes 403 from 404."""
+    await repo.create(
+        link_id="auth01",
+        target_url="https://example.com/a",
+        redirect_code=301,
+        edit_token_hash="a" * 64,
+    )
+
+    updated = await repo.update_authorized("auth01", "a" * 64, target_url="https://example.com/b")
+    assert updated.target_url == "https://example.com/b"
+
+    with pytest.raises(UnauthorizedError):
+        await repo.update_authorized("auth01", "b" * 64, target_url="https://example.com/c")
+    assert (await repo.get("auth01")).target_url == "https://example.com/b"
+
+    with pytest.raises(NotFoundError):
+        await repo.update_authorized("missing", "a" * 64)
+
+
+@pytest.mark.asyncio
+async def test_legacy_token_hash_is_accepted_and_upgraded(repo: LinkRepository) -> None:
+    """A legacy-form stored hash authorizes once and is rewritten to the current form."""
+    await repo.create(
+        link_id="legacy1",
+        target_url="https://example.com/a",
+        redirect_code=301,
+        edit_token_hash="l" * 64,
+    )
+
+    updated = await repo.update_authorized(
+        "legacy1", "n" * 64, legacy_token_hash="l" * 64, target_url="https://example.com/b"
+    )
+    assert updated.edit_token_hash == "n" * 64
+    with pytest.raises(UnauthorizedError):
+        await repo.update_authorized("legacy1", "l" * 64)
+
+    await repo.update("legacy1", edit_token_hash="l" * 64)
+    changed = await repo.change_id(
+        "legacy1", "legacy2", edit_token_hash="n" * 64, legacy_token_hash="l" * 64
+    )
+    assert changed.edit_token_hash == "n" * 64
+
+
+@pytest.mark.asyncio
+async def test_change_id_applies_field_updates_to_clone(repo: LinkRepository) -> None:
+    """Alias change writes requested field updates into the new document."""
+    await repo.create(
+        link_id="clone1",
+        target_url="https://example.com/old",
+        redirect_code=301,
+        edit_token_hash="a" * 64,
+    )
+
+    changed = await repo.change_id(
+        "clone1",
+        "clone2",
+        target_url="https://example.com/new",
+        redirect_code=HTTP_308_PERMANENT_REDIRECT,
+    )
+    assert changed.target_url == "https://example.com/new"
+    assert changed.redirect_code == HTTP_308_PERMANENT_REDIRECT
+    assert (await repo.get("clone1")).target_url == "https://example.com/old"
+
+
+@pytest.mark.asyncio
+async def test_change_id_with_wrong_token_hash_raises_unauthorized(repo: LinkRepository) -> None:
+    """A mismatched token hash leaves both aliases untouched."""
+    await repo.create(
+        link_id="guard1",
+        target_url="https://example.com/g",
+        redirect_code=301,
+        edit_token_hash="a" * 64,
+    )
+
+    with pytest.raises(UnauthorizedError):
+        await repo.change_id("guard1", "guard2", edit_token_hash="b" * 64)
+    with pytest.raises(NotFoundError):
+        await repo.change_id("missing", "guard3", edit_token_hash="a" * 64)
+    assert (await repo.get("guard1")).active
+    assert not await repo.exists("guard2")
+
+
+@pytest.mark.asyncio
+async def test_create_first_available_skips_taken_candidates(repo: LinkRepository) -> None:
+    """Taken candidates are screened out; all-taken raises ConflictError."""
+    for link_id in ("aaaaaa", "bbbbbb"):
+        await repo.create(
+            link_id=link_id,
+            target_url="https://example.com/x",
+            redirect_code=301,
+            edit_token_hash="a" * 64,
+        )
+    assert await repo.taken_ids(["aaaaaa", "cccccc", "bbbbbb"]) == {"aaaaaa", "bbbbbb"}
+
+    link = await repo.create_first_available(
+        ["aaaaaa", "bbbbbb", "cccccc"],
+        target_url="https://example.com/y",
+        redirect_code=302,
+        edit_token_hash="b" * 64,
+    )
+    assert link.link_id == "cccccc"
+
+    with pytest.raises(ConflictError):
+        await repo.create_first_available(
+            ["aaaaaa", "cccccc"],
+            target_url="https://example.com/z",
+            redirect_code=302,
+            edit_token_hash="c" * 64,
+        )
+
+
+@pytest.mark.asyncio
+async def test_update_without_fields_bumps_updated_at(
+    repo: LinkRepository,
+    mongo_collection: AsyncIOMotorCollection,  # type: ignore[type-arg]
+) -> None:
+    """An update with no field changes still stamps updated_at server-side."""
+    assert _update_spec({}) == {"$currentDate": {"updated_at": True}}
+
+    created = await repo.create(
+        link_id="touch1",
+        target_url="https://example.com/t",
+        redirect_code=301,
+        edit_token_hash="a" * 64,
+    )
+    # mongomock hands datetimes back naive (UTC); use a naive sentinel to match
+    stale = datetime(2000, 1, 1)
+    await mongo_collection.update_one({"link_id": "touch1"}, {"$set": {"updated_at": stale}})
+
+    touched = await repo.update("touch1")
+    assert touched.target_url == created.target_url
+    assert touched.updated_at > stale
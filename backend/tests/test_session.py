@@ -0,0 +1,48 @@
+"""Unit tests for Motor client construction."""
+
+import pytest
+
+from src.adapters.db.session import make_client
+
+
+def test_make_client_applies_pool_options(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Clients built by the factory carry the env-tuned pool and tz settings."""
+    monkeypatch.setenv("MONGODB_MAX_POOL_SIZE", "50")
+    monkeypatch.setenv("MONGODB_MIN_POOL_SIZE", "not-a-number")
+    client = make_client("mongodb://db.invalid:27017")
+    try:
+        pool = client.options.pool_options
+        assert pool.max_pool_size == 50
+        assert pool.min_pool_size == 10
+        assert client.codec_options.tz_aware
+    finally:
+        client.close()
+
+
+def test_make_client_clamps_min_pool_to_max_override(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A max-only override below the default minimum still builds a client."""
+    monkeypatch.setenv("MONGODB_MAX_POOL_SIZE", "5")
+    monkeypatch.delenv("MONGODB_MIN_POOL_SIZE", raising=False)
+    client = make_client("mongodb://db.invalid:27017")
+    try:
+        pool = client.options.pool_options
+        assert pool.max_pool_size == 5
+        assert pool.min_pool_size == 5
+    finally:
+        client.close()
+
+
+@pytest.mark.parametrize("value", ["0", "-5"])
+def test_make_client_treats_non_positive_timeouts_as_unset(
+    monkeypatch: pytest.MonkeyPatch, value: str
+) -> None:
+    """Zero or negative pool timeouts fall back to pymongo's no-limit default."""
+    monkeypatch.setenv("MONGODB_MAX_IDLE_TIME_MS", value)
+    monkeypatch.setenv("MONGODB_WAIT_QUEUE_TIMEOUT_MS", value)
+    client = make_client("mongodb://db.invalid:27017")
+    try:
+        pool = client.options.pool_options
+        assert pool.max_idle_time_seconds is None
+        assert pool.wait_queue_timeout is None
+    finally:
+        client.close()
@@ -3,6 +3,7 @@ import pytest
 from src.domain.constants import MAX_URL_LENGTH
 from src.domain.errors import ValidationError
 from src.domain.validators import (
+    _idna_encode,
     normalize_link_id,
     normalize_url,
     validate_link_id,
@@ -24,6 +25,13 @@ def test_validate_link_id_invalid_pattern():
         validate_link_id("bad space")
 
 
+@pytest.mark.parametrize("bad", ["", "caf\u00e9", "abc\n", "a.b"])
+def test_validate_link_id_rejects_empty_and_non_ascii(bad: str):
+    """Empty IDs and non-ASCII characters (even letter-like ones) are rejected."""
+    with pytest.raises(ValidationError):
+        validate_link_id(bad)
+
+
 def test_validate_link_id_reserved():
     """Reserved IDs should be rejected."""
     with pytest.raises(ValidationError):
@@ -32,10 +40,14 @@ def test_validate_link_id_reserved():
         validate_link_id("mgnt")
 
 
-def test_validate_link_id_length_bounds():
-    """Link-id length: 1..32 allowed; 33 should fail."""
-    validate_link_id("a")
-    validate_link_id("a" * 32)
+@pytest.mark.parametrize("link_id", ["a", "a" * 32])
+def test_validate_link_id_length_bounds(link_id: str):
+    """Link-id length: 1..32 allowed."""
+    validate_link_id(link_id)
+
+
+def test_validate_link_id_too_long():
+    """Link-id of 33 characters should fail."""
     with pytest.raises(ValidationError):
         validate_link_id("a" * 33)
 
@@ -50,9 +62,42 @@ def test_reserved_after_normalization():
 def test_normalize_url_ok_and_punycode():
     """URLs normalize and apply punycode to internationalized domains."""
     url = "https://exämple.com/path?q=1"
-    normalized = normalize_url(url)
-    assert normalized.startswith("https://")
-    assert "xn--" in normalized  # punycode applied
+    assert normalize_url(url) == "https://xn--exmple-cua.com/path?q=1"
+
+
+@pytest.mark.parametrize("url", ["https://a..b.com/", "https://\u00e4..b.com/"])
+def test_normalize_url_invalid_hostname_not_cached(url: str):
+    """Invalid hosts keep raising on repeated calls, via the ASCII check or the IDNA codec."""
+    for _ in range(2):
+        with pytest.raises(ValidationError):
+            normalize_url(url)
+
+
+def test_ascii_hostnames_bypass_idna_cache():
+    """Only non-ASCII hosts reach (and occupy) the IDNA codec cache."""
+    _idna_encode.cache_clear()
+    normalize_url("https://ascii-only.example/")
+    assert _idna_encode.cache_info().currsize == 0
+    normalize_url("https://b\u00fccher.example/")
+    assert _idna_encode.cache_info().currsize == 1
+
+
+def test_normalize_url_ascii_host_label_bounds():
+    """ASCII hosts skip the IDNA codec but keep its label-length rules."""
+    assert normalize_url("https://example.com./") == "https://example.com./"
+    assert normalize_url(f"https://{'a' * 63}.com/") == f"https://{'a' * 63}.com/"
+    for host in (f"{'a' * 64}.com", f"example.{'a' * 64}", ".example.com"):
+        with pytest.raises(ValidationError):
+            normalize_url(f"https://{host}/")
+
+
+def test_normalize_url_memoizes_results():
+    """Repeated targets are served from the cache."""
+    url = "https://example.com/memo"
+    normalize_url(url)
+    hits = normalize_url.cache_info().hits
+    assert normalize_url(url) == url
+    assert normalize_url.cache_info().hits == hits + 1
 
 
 def test_normalize_url_invalid_scheme():
@@ -67,6 +112,12 @@ def test_normalize_url_uppercase_scheme_ok():
     assert out.startswith("http://")
 
 
+def test_normalize_url_rebuilds_netloc_only_when_needed():
+    """Userinfo and port survive; host case is folded; plain hosts pass through."""
+    assert normalize_url("https://u:p@Example.COM:8443/x") == "https://u:p@example.com:8443/x"
+    assert normalize_url("https://example.com/a?b=1#c") == "https://example.com/a?b=1#c"
+
+
 def test_normalize_url_too_long():
     """Reject URLs exceeding MAX_URL_LENGTH prior to normalization."""
     long_path = "a" * (MAX_URL_LENGTH + 1 - len("https://example.com/"))
@@ -74,9 +125,13 @@ def test_normalize_url_too_long():
         normalize_url(f"https://example.com/{long_path}")
 
 
-def test_validate_redirect_code():
-    """Only allowed redirect codes pass validation."""
-    for c in (301, 302, 307, 308):
-        validate_redirect_code(c)
+@pytest.mark.parametrize("code", [301, 302, 307, 308])
+def test_validate_redirect_code_allowed(code: int):
+    """Allowed redirect codes pass validation."""
+    validate_redirect_code(code)
+
+
+def test_validate_redirect_code_rejected():
+    """Other redirect codes are rejected."""
     with pytest.raises(ValidationError):
         validate_redirect_code(303)